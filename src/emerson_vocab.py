@@ -3,54 +3,127 @@ from __future__ import annotations
 """
 Emerson's Dictionary — PDF vocabulary miner.
 This code helps you build a personal vocabulary dictionary:
-  - Extracts text from a PDF
+  - Extracts text from a PDF (pypdf, or pdfplumber with --layout)
   - Cleans common PDF artifacts
   - Finds rare-but-real English words you don't already have
   - Asks you interactively whether to add each word to "Emerson's Dictionary"
 """
 
 import argparse
-import json
+import functools
+import heapq
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import pdfplumber
 import nltk
+import orjson
+from pypdf import PdfReader
 from nltk.corpus import wordnet as wn
 from wordfreq import zipf_frequency
 
+
+def _ensure_nltk_data() -> None:
+    """
+    Download the WordNet data if it is not installed yet
+    nltk.download fetches the package index on every call, even when the data
+    is already installed, so it is only called for resources that are missing
+    """
+    for resource, package in (
+        ("corpora/wordnet", "wordnet"),
+        ("corpora/omw-1.4", "omw-1.4"),
+    ):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package, quiet=True)
+
+
 # download WordNet data once
-nltk.download("wordnet", quiet=True)
-nltk.download("omw-1.4", quiet=True)
+_ensure_nltk_data()
 
 # project paths
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 # UPDATED: Save directly to web/src/ so the React app can import it [cite: 11, 12]
 DICT_PATH = PROJECT_ROOT / "web" / "src" / "emerson_dictionary.json"
 
-# regex tokenizer: alphabetic words only
-WORD_PATTERN = re.compile(r"[A-Za-z]+")
+# PDFs shorter than this are extracted serially; the pool isn't worth starting
+PARALLEL_MIN_PAGES = 8
+
+# pages handed to a worker process at a time
+PAGES_PER_TASK = 4
+
+# tokenizer table: keeps ASCII letters (lowercasing A-Z for free) and turns
+# every other byte into a space (non-ASCII characters encode to bytes >= 0x80,
+# so they split words too)
+_TOKEN_TABLE = bytes(
+    c | 0x20 if (65 <= c <= 90 or 97 <= c <= 122) else 32 for c in range(256)
+)
+
+# whole words written in capitals, long enough to survive the length check
+ACRONYM_PATTERN = re.compile(rb"(?<![A-Za-z])[A-Z]{4,}(?![A-Za-z])")
+
+# word broken by a hyphen at a line break ("sen-\ntence"); the lookarounds
+# anchor the match on the hyphen instead of re-scanning each word
+HYPHEN_BREAK_PATTERN = re.compile(r"(?<=\w)-\s*\n\s*(?=\w)")
+
+# runs of two or more spaces/tabs (newlines are kept)
+SPACE_RUN_PATTERN = re.compile(r"[ \t]{2,}")
+
+# sentence splitter: runs of text ending in . ? or !
+# ACRONYM_PATTERN and SENTENCE_PATTERN run over UTF-8 encoded page text; every
+# byte of a multi-byte character is >= 0x80, so ASCII matches are unaffected
+SENTENCE_PATTERN = re.compile(rb"[^.?!]+[.?!]")
+
+# memoized wordfreq lookup; the same word is scored more than once per run
+_zipf = functools.lru_cache(maxsize=None)(zipf_frequency)
+
+# every lemma name in WordNet, built on first use by _wordnet_lemmas()
+_WN_LEMMAS: Optional[frozenset[str]] = None
 
 
 # Dictionary load & save
+@functools.lru_cache(maxsize=1)
+def _read_emerson_dict(path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse Emerson's Dictionary from disk
+    mtime_ns is only part of the cache key, so an edited file is re-read
+    """
+    try:
+        data = orjson.loads(path.read_bytes())
+    except orjson.JSONDecodeError:
+        # If the JSON is corrupted, start fresh
+        return {}
+    if isinstance(data, dict):
+        return data
+    return {}
+
+
 def load_emerson_dict(path: Path = DICT_PATH) -> Dict[str, Any]:
     """
     Load Emerson's Dictionary from disk
     Returns an empty dict if the file does not exist or is invalid
     """
-    if not path.exists():
-        return {}
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            return data
-        return {}
-    except json.JSONDecodeError:
-        # If the JSON is corrupted, start fresh
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
+    # Copy so callers can add words without touching the cached parse
+    return dict(_read_emerson_dict(path, mtime_ns))
 
 
 def save_emerson_dict(dictionary: Dict[str, Any], path: Path = DICT_PATH) -> None:
@@ -58,25 +131,58 @@ def save_emerson_dict(dictionary: Dict[str, Any], path: Path = DICT_PATH) -> Non
     Save Emerson's Dictionary to disk as printed JSON
     """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(dictionary, f, indent=2, ensure_ascii=False)
+    path.write_bytes(orjson.dumps(dictionary, option=orjson.OPT_INDENT_2))
 
 
 # PDF text extraction and cleaning
-def extract_text_from_pdf(pdf_path: Path) -> str:
+def _count_pages(pdf_path_str: str, layout: bool = False) -> int:
+    """
+    Return the number of pages in a PDF
+    """
+    if layout:
+        with pdfplumber.open(pdf_path_str) as pdf:
+            return len(pdf.pages)
+    return len(PdfReader(pdf_path_str).pages)
+
+
+def _extract_pages(
+    pdf_path_str: str,
+    start: int,
+    stop: int,
+    layout: bool = False,
+) -> List[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF (runs in a worker process)
+    pypdf skips layout analysis; pdfplumber is only used when layout is True
+    """
+    if layout:
+        with pdfplumber.open(pdf_path_str) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+    reader = PdfReader(pdf_path_str)
+    return [page.extract_text() or "" for page in reader.pages[start:stop]]
+
+
+def _iter_raw_pages(pdf_path: Path, layout: bool = False) -> Iterator[str]:
     """
-    Extract raw text from all pages of a PDF using pdfplumber
+    Yield the raw text of each page of a PDF, in order
+    Large PDFs are split across a process pool, a few pages per task
     """
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-    text_chunks: List[str] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text_chunks.append(page_text)
+    n_pages = _count_pages(str(pdf_path), layout=layout)
+    if n_pages < PARALLEL_MIN_PAGES:
+        yield from _extract_pages(str(pdf_path), 0, n_pages, layout)
+        return
 
-    return "\n".join(text_chunks)
+    starts = range(0, n_pages, PAGES_PER_TASK)
+    stops = [min(start + PAGES_PER_TASK, n_pages) for start in starts]
+    with ProcessPoolExecutor() as executor:
+        for pages in executor.map(
+            _extract_pages, repeat(str(pdf_path)), starts, stops, repeat(layout)
+        ):
+            yield from pages
 
 
 def clean_pdf_text(raw: str) -> str:
@@ -86,88 +192,149 @@ def clean_pdf_text(raw: str) -> str:
     - Normalize multiple spaces/tabs
     """
     # Fix hyphen + newline splits
-    no_hyphen_breaks = re.sub(r"(\w+)-\s*\n\s*(\w+)", r"\1\2", raw)
+    no_hyphen_breaks = HYPHEN_BREAK_PATTERN.sub("", raw)
 
     # Collapse repeated spaces/tabs (keep newlines)
-    normalized = re.sub(r"[ \t]{2,}", " ", no_hyphen_breaks)
+    normalized = SPACE_RUN_PATTERN.sub(" ", no_hyphen_breaks)
 
     return normalized
 
 
-# Tokenization & candidate selection
-def tokenize(text: str) -> List[str]:
+def iter_page_texts(pdf_path: Path, layout: bool = False) -> Iterator[str]:
     """
-    Simple tokenizer that returns only alphabetic word tokens
+    Yield the cleaned text of a PDF one page at a time,
+    so the whole document never has to be held in memory
+    The unfinished sentence at the end of each page (everything after its
+    last . ? or !, including a trailing "con-") is carried over to the next
+    page, so words and sentences that cross a page break are rejoined just
+    as if the pages had been joined with newlines
+    (a page with no sentence end at all is carried over whole)
     """
-    return WORD_PATTERN.findall(text)
+    tail = ""
+    for raw in _iter_raw_pages(pdf_path, layout=layout):
+        text = tail + "\n" + raw if tail else raw
+        end = max(text.rfind("."), text.rfind("?"), text.rfind("!")) + 1
+        tail = text[end:]
+        if end:
+            yield clean_pdf_text(text[:end])
 
+    if tail:
+        yield clean_pdf_text(tail)
 
-def is_candidate_word(
-    word: str,
-    emerson_dict: Dict[str, Any],
-    freq_threshold: float = 3.5,
-) -> bool:
+
+# Tokenization & candidate selection
+def _wordnet_lemmas() -> frozenset[str]:
     """
-    Decide if a word is a candidate for learning
+    Return the set of all WordNet lemma names, loading it on first call
     """
-    w = word.lower()
-
-    # Too short to be interesting
-    if len(w) <= 3:
-        return False
+    global _WN_LEMMAS
+    if _WN_LEMMAS is None:
+        _WN_LEMMAS = frozenset(wn.all_lemma_names())
+    return _WN_LEMMAS
 
-    # You already know it
-    if w in emerson_dict:
-        return False
 
-    # Likely acronym
-    if word.isupper():
-        return False
-
-    # Must be a real English word in WordNet
-    if not wn.synsets(w):
-        return False
+def _tokenize_bytes(data: bytes) -> List[str]:
+    """
+    Simple tokenizer for UTF-8 encoded text that returns only alphabetic
+    word tokens, lowercased
+    Same tokens as re.findall(r"[A-Za-z]+", text.lower()), but the scan is a
+    single bytes.translate + split in C rather than a regex match per token
+    """
+    return data.translate(_TOKEN_TABLE).decode("ascii").split()
 
-    # Use global frequency estimates
-    freq = zipf_frequency(w, "en")
 
-    # Ignore things unseen in corpora
-    if freq == 0.0:
-        return False
+def _make_candidate_filter(
+    emerson_keys: frozenset[str],
+    acronyms: AbstractSet[str],
+    freq_threshold: float = 3.5,
+) -> Callable[[str], Optional[float]]:
+    """
+    Build the check that decides if a lowercased word is a candidate for learning
+    The check returns the word's Zipf frequency if it is, None otherwise
+    Everything it needs is bound as a closure variable, so the per-word
+    calls use local lookups instead of module globals
+    """
+    zipf = _zipf
+    lemmas = _wordnet_lemmas()
+    morphy = wn.morphy
 
     # Tune these bounds
     min_freq = 1.5   # too low → probably garbage or hyper-rare
     max_freq = freq_threshold  # too high
 
-    if not (min_freq <= freq <= max_freq):
-        return False
+    def check(word: str) -> Optional[float]:
+        # Too short to be interesting, already known, or likely an acronym
+        if len(word) <= 3 or word in emerson_keys or word in acronyms:
+            return None
+
+        # Must be a real English word in WordNet
+        # (inflected forms like "pullets" are not lemmas, so fall back to morphy)
+        if word not in lemmas and morphy(word) is None:
+            return None
+
+        # Use global frequency estimates; unseen words score 0.0 and fail here
+        freq = zipf(word, "en")
+        if not (min_freq <= freq <= max_freq):
+            return None
 
-    return True
+        return freq
+
+    return check
 
 
 def get_candidate_words(
-    text: str,
+    pages: Iterable[str],
     emerson_dict: Dict[str, Any],
     max_words: int = 100,
     freq_threshold: float = 3.5,
+    sentence_index: Optional[Dict[str, bytes]] = None,
 ) -> List[str]:
     """
-    From cleaned text, return a ranked list of candidate vocabulary words
+    From cleaned page texts (as yielded by iter_page_texts, each starting at a
+    sentence boundary), return a ranked list of candidate vocabulary words
+    If sentence_index is given, it is filled with example sentences in the same pass
     """
-    tokens = tokenize(text)
-    counts: Counter[str] = Counter(w.lower() for w in tokens)
+    counts: Counter[str] = Counter()
+
+    # How often each word shows up in ALL CAPS; a word that never
+    # appears any other way is likely an acronym
+    upper_counts: Counter[bytes] = Counter()
 
-    candidates: List[tuple[str, int, float]] = []
+    for page in pages:
+        # Encode once; every scan below runs over the same 1-byte-per-char buffer
+        data = page.encode("utf-8", "replace")
+        tokens = _tokenize_bytes(data)
+        counts.update(tokens)
+        upper_counts.update(ACRONYM_PATTERN.findall(data))
+        if sentence_index is not None:
+            index_sentences(data, sentence_index, tokens)
+
+    acronyms = set()
+    for upper, upper_count in upper_counts.items():
+        word = upper.decode("ascii").lower()
+        if counts[word] == upper_count:
+            acronyms.add(word)
+
+    # membership checks only need the keys, not the entries; lowercase them
+    # here since candidate words are always lowercase (the entries themselves
+    # are saved back untouched)
+    emerson_keys = frozenset(word.lower() for word in emerson_dict)
+
+    check = _make_candidate_filter(emerson_keys, acronyms, freq_threshold=freq_threshold)
+
+    # (rarity, -document_frequency, word) so plain tuple order is the ranking
+    candidates: List[tuple[float, int, str]] = []
 
     for word, count in counts.items():
-        if is_candidate_word(word, emerson_dict, freq_threshold=freq_threshold):
-            freq = zipf_frequency(word, "en")
-            candidates.append((word, count, freq))
+        freq = check(word)
+        if freq is not None:
+            candidates.append((freq, -count, word))
 
-    # Sort by (rarity, -document_frequency)
-    candidates.sort(key=lambda x: (x[2], -x[1]))
+    # Only the top max_words are needed, so keep a bounded heap instead of
+    # sorting every candidate
+    top = heapq.nsmallest(max_words, candidates)
 
-    return [w for (w, _count, _freq) in candidates[:max_words]]
+    return [w for (_freq, _neg_count, w) in top]
 
 
 # Definitions and example sentences
@@ -182,34 +349,96 @@ def get_definition(word: str) -> Optional[str]:
     return synsets[0].definition()
 
 
+def index_sentences(
+    data: bytes,
+    sentence_index: Dict[str, bytes],
+    words: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Record the first sentence each lowercased word in the UTF-8 encoded
+    text appears in
+    Sentences are kept as bytes and only decoded by find_example_sentence
+    Words already in sentence_index keep their earlier sentence
+    words can pass in the text's tokens if the caller already has them
+    """
+    if words is None:
+        words = _tokenize_bytes(data)
+
+    # Once most of the vocabulary has been seen, most pages add nothing new
+    # and can skip sentence splitting entirely
+    new_words = set(words).difference(sentence_index)
+    if not new_words:
+        return
+
+    for match in SENTENCE_PATTERN.finditer(data):
+        sentence = match.group(0)
+        found = new_words.intersection(_tokenize_bytes(sentence))
+        if not found:
+            continue
+        for w in found:
+            sentence_index[w] = sentence
+        new_words -= found
+        if not new_words:
+            break
+
+
 def find_example_sentence(
-    text: str,
+    sentence_index: Dict[str, bytes],
     word: str,
     max_len: int = 220,
 ) -> Optional[str]:
     """
-    Find a sentence from the original text that contains the given word
+    Find a sentence from the original text that contains the given
+    (lowercased) word
     Returns a truncated version if too long
     """
-    pattern = re.compile(
-        r"[^.?!]*\b" + re.escape(word) + r"\b[^.?!]*[.?!]",
-        re.IGNORECASE,
-    )
-    match = pattern.search(text)
-    if not match:
+    encoded = sentence_index.get(word)
+    if encoded is None:
         return None
 
-    sentence = match.group(0).strip()
+    sentence = encoded.decode("utf-8").strip()
     if len(sentence) > max_len:
         sentence = sentence[: max_len - 3] + "..."
     return sentence
 
 
+def _lookup_word(
+    word: str,
+    sentence_index: Dict[str, bytes],
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the definition and example sentence for a word
+    """
+    return get_definition(word), find_example_sentence(sentence_index, word)
+
+
+def _iter_word_details(
+    words: List[str],
+    sentence_index: Dict[str, bytes],
+) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Yield (word, definition, example) for each word
+    The next word is looked up in a background thread while the caller
+    is waiting on the user for the current one
+    """
+    if not words:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(_lookup_word, words[0], sentence_index)
+        for i, word in enumerate(words):
+            definition, example = pending.result()
+            if i + 1 < len(words):
+                pending = executor.submit(_lookup_word, words[i + 1], sentence_index)
+            yield word, definition, example
+
+
 # Interactive CLI flow
 def review_candidates_interactively(
     pdf_path: Path,
     max_words: int = 50,
     freq_threshold: float = 3.5,
+    layout: bool = False,
 ) -> None:
     """
     Main interactive loop
@@ -218,15 +447,16 @@ def review_candidates_interactively(
     emerson_dict = load_emerson_dict()
 
     print(f"\nExtracting text from: {pdf_path}")
-    raw_text = extract_text_from_pdf(pdf_path)
-    text = clean_pdf_text(raw_text)
+    pages = iter_page_texts(pdf_path, layout=layout)
 
     print("\nFinding candidate vocabulary words...")
+    sentence_index: Dict[str, bytes] = {}
     candidates = get_candidate_words(
-        text,
+        pages,
         emerson_dict,
         max_words=max_words,
         freq_threshold=freq_threshold,
+        sentence_index=sentence_index,
     )
 
     if not candidates:
@@ -235,10 +465,7 @@ def review_candidates_interactively(
 
     print(f"Found {len(candidates)} candidate words.\n")
 
-    for word in candidates:
-        definition = get_definition(word)
-        example = find_example_sentence(text, word)
-
+    for word, definition, example in _iter_word_details(candidates, sentence_index):
         print("=" * 60)
         print(f"Word: {word}")
         print(f"Definition: {definition or '[no WordNet definition found]'}")
@@ -291,6 +518,14 @@ def parse_args() -> argparse.Namespace:
             "Try 4.0 for slightly easier words, 3.0 for harder words."
         ),
     )
+    parser.add_argument(
+        "--layout",
+        action="store_true",
+        help=(
+            "Extract text with pdfplumber's layout analysis instead of pypdf. "
+            "Slower, but can help with tables and multi-column pages."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -301,6 +536,7 @@ def main() -> None:
         pdf_path=pdf_path,
         max_words=args.max_words,
         freq_threshold=args.freq_threshold,
+        layout=args.layout,
     )
 
 